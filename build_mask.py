@@ -1,125 +1,155 @@
-import gdstk
-from datetime import datetime
-import numpy as np
-
-import config
-
-
-# define layer mapping
-# fill / boundary denotes whether the geometric feature should be kept as a
-# polygon or if the boundary should be the result
-config.layers = {
-    "M0": ( 0, 0, "fill"),      # metallisation top eletrode of FE / STO etch
-    "M1": ( 1, 0, "fill"),      # metallisation to bottom electrode of FE
-    "M2": (11, 0, "boundary"),  # metallisation from M0 to W2 (set same as top wiring)
-    "W1": (10, 0, "boundary"),  # lower layer of wiring
-    "W2": (11, 0, "boundary"),  # upper layer of wiring
-    "V1": (21, 0, "fill"),      # via through FE
-    "V2": (22, 0, "fill"),      # via through bonding interface, M1 to W1
-    "V3": (23, 0, "fill"),      # via through passivation, M2 to M0
-    "V4": (24, 0, "fill"),      # via through passivation, M2/W2 to W1
-    "label": (50, 0, "fill"),   # label in separate layer for convenience
-}
-# clearances
-config.UVL = 2
-config.EBL = 0.05
-
-# general design parameter
-config.wire_width = 3
-config.boundary_width = 1
-
-config.pad_dim = 100
-
-config.pad_device_spacing = max(10, config.UVL)
-
-# define location to save mask
-#outfile = f"mask_{datetime.now().strftime('%Y%m%d-%H%M%S')}.gds"
-outfile = "mask.gds"
-
-# reimport so updates config
-import geometry as geom
-import components as comp
-
-
-# example placement of structures
-dev0 = comp.FED2T("FE", 25)
-dev1 = comp.make_vector_1xN("VECTOR", np.ones(25)*5)
-dev2 = comp.make_xbar_2x2("XBAR", [[10, 12], [12, 10]])
-short0 = comp.FED2T("SHORT", 1, short=True)
-
-top = gdstk.Cell("TOP")
-top.add(gdstk.Reference(dev0, (0, 0)))
-top.add(gdstk.Reference(dev1, (300, 0)))
-top.add(gdstk.Reference(dev2, (600, 0)))
-top.add(gdstk.Reference(short0, (950, 0)))
-
-
-# place to library
-lib = gdstk.Library()
-
-def add_children(cell: gdstk.Cell, lib: gdstk.Library) -> None:
-    """Helper function to automate adding referenced cells to the library.
-    """
-    _ = lib.add(cell)
-    for ref in cell.references:
-        if ref.cell.name not in [cell.name for cell in lib.cells]:
-            add_children(ref.cell, lib)    
-
-add_children(top, lib)
-
-# would run DRC here if wanted to
-
-# then do any inverting/converting to boundary on flattened cells
-flat_top = top.flatten()
-mapping = {}
-
-# convert all to polygons
-for path in flat_top.paths:
-    _ = flat_top.add(*path.to_polygons())
-
-# sort by layers
-for polygon in flat_top.polygons:
-    layer_datatype = (polygon.layer, polygon.datatype)
-    if layer_datatype in mapping.keys():
-        mapping[layer_datatype].append(polygon)
-    else:
-        mapping[layer_datatype] = [polygon]
-
-# merge all polygons for layer operations
-for layer_datatype, polygons in mapping.items():
-    mapping[layer_datatype] = gdstk.boolean(polygons, [], "or", layer=layer_datatype[0], datatype=layer_datatype[1])
-
-# apply boundary operator
-processed_layers = []
-for layer in config.layers.values():
-    ld = layer[:2]
-    if ld not in processed_layers and layer[2] == "boundary":
-        mapping[ld] = geom.flatten([geom.convert_to_boundary(p, config.boundary_width) for p in mapping[ld]])
-    processed_layers.append(ld)
-
-# put everthing in a new cell
-flat_cell = gdstk.Cell("TOP")
-for polygons in mapping.values():
-    _ = flat_cell.add(*polygons)
-
-# add the labels just in case they are used after all
-for label in flat_top.labels:
-    flat_cell.add(label)
-
-# add all to library
-flat_lib = gdstk.Library()
-_ = flat_lib.add(flat_cell)
-
-flat_lib.write_gds(outfile)
-
-# if want to merge with e.g. template file
-#template_lib = gdstk.read_gds("template.gds")
-#
-# look for cell to place into and check for naming collisions
-#target_cell_name = "your_die_design"
-#for cell in template_lib.cells:
-#    if cell.name == target_cell_name:
-#        cell.add(gdstk.Reference(flat_cell))
-#        template_lib.add(flat_cell)
-#
+import gdstk
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import multiprocessing
+import os
+import numpy as np
+
+import config
+
+
+# define layer mapping
+# fill / boundary denotes whether the geometric feature should be kept as a
+# polygon or if the boundary should be the result
+config.layers = {
+    "M0": ( 0, 0, "fill"),      # metallisation top eletrode of FE / STO etch
+    "M1": ( 1, 0, "fill"),      # metallisation to bottom electrode of FE
+    "M2": (11, 0, "boundary"),  # metallisation from M0 to W2 (set same as top wiring)
+    "W1": (10, 0, "boundary"),  # lower layer of wiring
+    "W2": (11, 0, "boundary"),  # upper layer of wiring
+    "V1": (21, 0, "fill"),      # via through FE
+    "V2": (22, 0, "fill"),      # via through bonding interface, M1 to W1
+    "V3": (23, 0, "fill"),      # via through passivation, M2 to M0
+    "V4": (24, 0, "fill"),      # via through passivation, M2/W2 to W1
+    "label": (50, 0, "fill"),   # label in separate layer for convenience
+}
+# clearances
+config.UVL = 2
+config.EBL = 0.05
+
+# general design parameter
+config.wire_width = 3
+config.boundary_width = 1
+# fabrication grid, used as clipping precision
+config.GRID = 1e-3
+
+config.pad_dim = 100
+
+config.pad_device_spacing = max(10, config.UVL)
+
+# define location to save mask
+#outfile = f"mask_{datetime.now().strftime('%Y%m%d-%H%M%S')}.gds"
+outfile = "mask.gds"
+
+# reimport so updates config
+import geometry as geom
+import components as comp
+
+
+# example placement of structures
+dev0 = comp.FED2T("FE", 25)
+dev1 = comp.make_vector_1xN("VECTOR", np.ones(25)*5)
+dev2 = comp.make_xbar_2x2("XBAR", [[10, 12], [12, 10]])
+short0 = comp.FED2T("SHORT", 1, short=True)
+
+top = gdstk.Cell("TOP")
+top.add(gdstk.Reference(dev0, (0, 0)))
+top.add(gdstk.Reference(dev1, (300, 0)))
+top.add(gdstk.Reference(dev2, (600, 0)))
+top.add(gdstk.Reference(short0, (950, 0)))
+
+
+# place to library
+lib = gdstk.Library()
+
+def add_children(cell: gdstk.Cell, lib: gdstk.Library) -> None:
+    """Helper function to automate adding referenced cells to the library.
+    Raises a ValueError if two distinct cells carry the same name, since the
+    written library would silently alias them and break downstream DRC.
+    """
+    name_index: dict[str, gdstk.Cell] = {cell.name: cell}
+    queue = deque([cell])
+    while queue:
+        current = queue.popleft()
+        _ = lib.add(current)
+        for ref in current.references:
+            child = ref.cell
+            known = name_index.get(child.name)
+            if known is None:
+                name_index[child.name] = child
+                queue.append(child)
+            elif known is not child:
+                raise ValueError(f"Name collision: {child.name}")
+
+add_children(top, lib)
+
+# would run DRC here if wanted to
+
+# then do any inverting/converting to boundary on flattened cells;
+# get_polygons walks the hierarchy once in the gdstk core, converting paths
+# to polygons along the way, instead of flattening first and walking the
+# flattened cell again for the path conversion
+flat_polygons = top.get_polygons(include_paths=True, depth=None)
+
+# sort by layers: one lexsort groups the polygons contiguously per
+# (layer, datatype) and the groups fall out as slices of the sorted order
+keys = np.array([(polygon.layer, polygon.datatype) for polygon in flat_polygons], dtype=np.int32)
+order = np.lexsort((keys[:, 1], keys[:, 0]))
+splits = np.flatnonzero(np.any(np.diff(keys[order], axis=0) != 0, axis=1)) + 1
+mapping = {}
+for group in np.split(order, splits):
+    layer_datatype = (int(keys[group[0], 0]), int(keys[group[0], 1]))
+    mapping[layer_datatype] = [flat_polygons[i] for i in group]
+
+# merge all polygons for layer operations, tiling dense layers so no single
+# clipping call sees the full polygon count; layers are independent, so the
+# merges run in parallel worker processes; for boundary layers the boundary
+# conversion is fused into the same worker, so the merged intermediate never
+# crosses back into the parent process
+boundary_lds = {layer[:2] for layer in config.layers.values() if layer[2] == "boundary"}
+
+def _merge_layer(task: tuple[tuple[int, int], list[np.ndarray]]) -> tuple[tuple[int, int], list[np.ndarray]]:
+    """Worker for the per-layer merge. gdstk objects do not pickle, so
+    polygons cross the process boundary as raw point arrays.
+    """
+    layer_datatype, point_arrays = task
+    polygons = [gdstk.Polygon(points) for points in point_arrays]
+    if layer_datatype in boundary_lds:
+        merged = geom.merge_and_boundary(polygons, config.boundary_width, precision=config.GRID, layer=layer_datatype[0], datatype=layer_datatype[1])
+    else:
+        merged = geom.boolean_tiled(polygons, "or", precision=config.GRID, layer=layer_datatype[0], datatype=layer_datatype[1])
+    return layer_datatype, [polygon.points for polygon in merged]
+
+tasks = [(ld, [polygon.points for polygon in polygons]) for ld, polygons in mapping.items()]
+# fork context, as spawned workers would re-execute this script on import
+with ProcessPoolExecutor(max_workers=min(len(tasks), os.cpu_count() or 1), mp_context=multiprocessing.get_context("fork")) as executor:
+    for layer_datatype, point_arrays in executor.map(_merge_layer, tasks):
+        mapping[layer_datatype] = [gdstk.Polygon(points, layer=layer_datatype[0], datatype=layer_datatype[1]) for points in point_arrays]
+
+# put everthing in a new cell
+flat_cell = gdstk.Cell("TOP")
+for polygons in mapping.values():
+    _ = flat_cell.add(*polygons)
+
+# add the labels just in case they are used after all
+for label in top.get_labels(depth=None):
+    flat_cell.add(label)
+
+# add all to library
+flat_lib = gdstk.Library()
+_ = flat_lib.add(flat_cell)
+
+flat_lib.write_gds(outfile)
+
+# if want to merge with e.g. template file
+#template_lib = gdstk.read_gds("template.gds")
+#
+# look for cell to place into and check for naming collisions
+#target_cell_name = "your_die_design"
+#for cell in template_lib.cells:
+#    if cell.name == target_cell_name:
+#        cell.add(gdstk.Reference(flat_cell))
+#        template_lib.add(flat_cell)
+#
 #template_lib.write_gds(outfile)
\ No newline at end of file
@@ -1,4 +1,7 @@
+import functools
+
 import gdstk
+import numpy as np
 
 import config
 
@@ -7,6 +10,25 @@ import features as feat
 
 lower_pad = feat.make_lower_pad(config.pad_dim)
 
+# (layer, datatype) tuples hoisted out of the placement code
+_W1 = config.layers["W1"][:2]
+_LABEL = config.layers["label"][:2]
+
+
+@functools.lru_cache(maxsize=None)
+def _ferro_device_cached(mesa_size: float, via_size: float, short: bool) -> tuple[gdstk.Cell, tuple[float, float], tuple[float, float]]:
+    return feat.make_ferro_device(mesa_size, via_size, short=short)
+
+
+def _ferro_device(mesa_size: float, via_size: float, short: bool = False) -> tuple[gdstk.Cell, tuple[float, float], tuple[float, float]]:
+    """Memoized front end to feat.make_ferro_device, so repeated
+    (mesa_size, via_size, short) combinations share a single cell that is
+    referenced multiple times instead of being rebuilt per instance.
+    The sizes are quantized well below the fabrication grid to give stable
+    cache keys for float inputs.
+    """
+    return _ferro_device_cached(round(mesa_size, 6), round(via_size, 6), short)
+
 
 def FED2T(name: str, mesa_size: float, via_size: float=config.UVL, short: bool=False) -> gdstk.Cell:
     """Generate a cell containg a two terminal ferroelectric resistive devices.
@@ -28,7 +50,7 @@ def FED2T(name: str, mesa_size: float, via_size: float=config.UVL, short: bool=F
     gdstk.Cell
         The cell containing the device components.
     """
-    Device, lower, upper = feat.make_ferro_device(mesa_size, via_size, short=short)
+    Device, lower, upper = _ferro_device(mesa_size, via_size, short)
     Main = gdstk.Cell(f"2T_M{mesa_size}_V{via_size}")
     # device
     D = gdstk.Reference(Device, (0,0))
@@ -38,14 +60,14 @@ def FED2T(name: str, mesa_size: float, via_size: float=config.UVL, short: bool=F
     # wires
     wire_LP_D = feat.make_wire(
         geom.route_90deg((D.origin[0] + lower[0], D.origin[1] + lower[1] + config.wire_width/2), LP.origin, "|-"),
-        config.wire_width, "W1")
+        config.wire_width, _W1)
     wire_UP_D = feat.make_wire(
         geom.route_90deg((D.origin[0] + upper[0], D.origin[1] + upper[1]), UP.origin),
-        config.wire_width, "W1")
+        config.wire_width, _W1)
     # stick together
     _ = Main.add(UP, LP, wire_LP_D, wire_UP_D, D)
     # label
-    label = feat.make_label(name, origin=(0, D.origin[1] - config.pad_device_spacing - config.pad_dim/2), layer=config.layers["label"][0], datatype=config.layers["label"][1])
+    label = feat.make_label(name, origin=(0, D.origin[1] - config.pad_device_spacing - config.pad_dim/2), layer=_LABEL[0], datatype=_LABEL[1])
     _ = Main.add(*label)
     return Main
 
@@ -71,24 +93,49 @@ def make_vector_1xN(name: str, mesa_sizes: list[float], via_size: float=config.U
     N = len(mesa_sizes)
     Main = gdstk.Cell(f"Vector{N}_M{str(mesa_sizes).replace(', ', '_')[1:-1]}_V{via_size}")
     y_step = config.pad_dim + config.pad_dim/4
-    for i, mesa_size in enumerate(mesa_sizes):
-        Device, lower, upper = feat.make_ferro_device(mesa_size, via_size)
-        D = gdstk.Reference(Device, (0, i*y_step))
-        UP = gdstk.Reference(lower_pad, (D.origin[0] + upper[0] - config.pad_device_spacing - config.pad_dim/2, D.origin[1] + upper[1]))
-        LP = gdstk.Reference(lower_pad, (D.origin[0] + lower[0] + config.pad_device_spacing + config.pad_dim/2, D.origin[1] + lower[1]))
+    if len({round(mesa_size, 6) for mesa_size in mesa_sizes}) == 1:
+        # all elements identical: build a single unit cell (device, pads and
+        # wires) and repeat it as a reference array, expanded at write time
+        Device, lower, upper = _ferro_device(mesa_sizes[0], via_size)
+        unit = gdstk.Cell(f"{Main.name}_unit")
+        D = gdstk.Reference(Device, (0, 0))
+        UP = gdstk.Reference(lower_pad, (upper[0] - config.pad_device_spacing - config.pad_dim/2, upper[1]))
+        LP = gdstk.Reference(lower_pad, (lower[0] + config.pad_device_spacing + config.pad_dim/2, lower[1]))
         wire_UP_D = feat.make_wire(
-            geom.route_90deg((D.origin[0] + upper[0], D.origin[1] + upper[1]), UP.origin),
-            config.wire_width, "W1")
+            geom.route_90deg((upper[0], upper[1]), UP.origin),
+            config.wire_width, _W1)
         wire_LP_D = feat.make_wire(
-            geom.route_90deg((D.origin[0] + lower[0], D.origin[1] + lower[1] + config.wire_width/2), LP.origin, "|-"),
-            config.wire_width, "W1")
-        _ = Main.add(LP, UP, wire_UP_D, wire_LP_D, D)
+            geom.route_90deg((lower[0], lower[1] + config.wire_width/2), LP.origin, "|-"),
+            config.wire_width, _W1)
+        _ = unit.add(LP, UP, wire_UP_D, wire_LP_D, D)
+        _ = Main.add(feat.place_array(unit, (0, 0), 1, N, 0, y_step))
+    else:
+        devices = [_ferro_device(mesa_size, via_size) for mesa_size in mesa_sizes]
+        # the contact points depend only on the via size and device extent,
+        # so all pad origins and wire waypoints are computed in one shot
+        lower, upper = devices[0][1], devices[0][2]
+        ys = np.arange(N) * y_step
+        up_origins = np.column_stack((np.full(N, upper[0] - config.pad_device_spacing - config.pad_dim/2), ys + upper[1]))
+        lp_origins = np.column_stack((np.full(N, lower[0] + config.pad_device_spacing + config.pad_dim/2), ys + lower[1]))
+        up_starts = np.column_stack((np.full(N, upper[0]), ys + upper[1]))
+        lp_starts = np.column_stack((np.full(N, lower[0]), ys + lower[1] + config.wire_width/2))
+        for i, (Device, _, _) in enumerate(devices):
+            D = gdstk.Reference(Device, (0, ys[i]))
+            UP = gdstk.Reference(lower_pad, up_origins[i])
+            LP = gdstk.Reference(lower_pad, lp_origins[i])
+            wire_UP_D = feat.make_wire(
+                geom.route_90deg(tuple(up_starts[i]), tuple(up_origins[i])),
+                config.wire_width, _W1)
+            wire_LP_D = feat.make_wire(
+                geom.route_90deg(tuple(lp_starts[i]), tuple(lp_origins[i]), "|-"),
+                config.wire_width, _W1)
+            _ = Main.add(LP, UP, wire_UP_D, wire_LP_D, D)
     # connect all right pads with another
-    shared_pad = geom.rectangle(config.pad_dim*2/3, y_step * N - config.pad_dim, origin=(LP.origin[0],config.pad_device_spacing+(y_step*i-config.pad_dim/2)/2))
-    geom.set_layer_datatype(shared_pad, config.layers["W1"])
+    lp_x = lower[0] + config.pad_device_spacing + config.pad_dim/2
+    shared_pad = geom.rectangle(config.pad_dim*2/3, y_step * N - config.pad_dim, origin=(lp_x, config.pad_device_spacing+(y_step*(N-1)-config.pad_dim/2)/2), layer=_W1[0], datatype=_W1[1])
     _ = Main.add(shared_pad)
     # label
-    label = feat.make_label(name, origin=(0, - config.pad_device_spacing - config.pad_dim/2), layer=config.layers["label"][0], datatype=config.layers["label"][1])
+    label = feat.make_label(name, origin=(0, - config.pad_device_spacing - config.pad_dim/2), layer=_LABEL[0], datatype=_LABEL[1])
     _ = Main.add(*label)
     return Main
 
@@ -113,10 +160,10 @@ def make_xbar_2x2(name: str, mesa_sizes: list[list[float, float], list[float, fl
     """
     Main = gdstk.Cell(f"XBAR_M{str(mesa_sizes).replace(', ', '_')[2:-2].replace(']_[', '__')}_V{via_size}")
     sep = config.pad_dim/4
-    Device_NW, lower_NW, upper_NW = feat.make_ferro_device(mesa_sizes[0][0], via_size)
-    Device_NE, lower_NE, upper_NE = feat.make_ferro_device(mesa_sizes[0][1], via_size)
-    Device_SW, lower_SW, upper_SW = feat.make_ferro_device(mesa_sizes[1][0], via_size)
-    Device_SE, lower_SE, upper_SE = feat.make_ferro_device(mesa_sizes[1][1], via_size)
+    Device_NW, lower_NW, upper_NW = _ferro_device(mesa_sizes[0][0], via_size)
+    Device_NE, lower_NE, upper_NE = _ferro_device(mesa_sizes[0][1], via_size)
+    Device_SW, lower_SW, upper_SW = _ferro_device(mesa_sizes[1][0], via_size)
+    Device_SE, lower_SE, upper_SE = _ferro_device(mesa_sizes[1][1], via_size)
     D_NW = gdstk.Reference(Device_NW, ( 0, sep + config.pad_dim))
     D_NE = gdstk.Reference(Device_NE, (sep*2, sep + config.pad_dim))
     D_SW = gdstk.Reference(Device_SW, ( 0, 0))
@@ -131,46 +178,46 @@ def make_xbar_2x2(name: str, mesa_sizes: list[list[float, float], list[float, fl
     temp_point = (D_NW.origin[0] + upper_NW[0], D_NW.origin[1] + upper_NW[1] + config.pad_dim/4)
     wire_UP_NW = feat.make_wire(
             geom.route_90deg((D_NW.origin[0] + upper_NW[0], D_NW.origin[1] + upper_NW[1]), UP_1.origin),
-            config.wire_width, "W1")
+            config.wire_width, _W1)
     wire_UP_NE = feat.make_wire(
             geom.route_90deg((D_NE.origin[0] + upper_NE[0], D_NE.origin[1] + upper_NE[1]), temp_point, "|-") +
             geom.route_90deg(temp_point, UP_1.origin, "|-"),
-            config.wire_width, "W1")
+            config.wire_width, _W1)
     _ = Main.add(wire_UP_NW, wire_UP_NE)
     # UP_2
     temp_point = (D_SE.origin[0] + upper_SE[0], D_SW.origin[1] + upper_SW[1] - config.pad_dim/4)
     wire_UP_SW = feat.make_wire(
             geom.route_90deg((D_SW.origin[0] + upper_SW[0], D_SW.origin[1] + upper_SW[1]), temp_point, "|-"),
-            config.wire_width, "W1")
+            config.wire_width, _W1)
     temp_point2 = (D_SE.origin[0] - 3*upper_SE[0], 0)
     wire_UP_SE = feat.make_wire(
             [(D_SE.origin[0] + upper_SE[0], D_SE.origin[1] + upper_SE[1]), temp_point] +
              geom.route_90deg(temp_point, temp_point2, "-|") + [UP_2.origin],
-            config.wire_width, "W1")
+            config.wire_width, _W1)
     _ = Main.add(wire_UP_SW, wire_UP_SE)
     # LP_1
     temp_point = (D_NW.origin[0] + lower_NW[0], (25 + config.pad_dim)/2)
     wire_LP_NW = feat.make_wire(
             geom.route_90deg((D_NW.origin[0] + lower_NW[0], D_NW.origin[1] + lower_NW[1]), temp_point, "|-"),
-            config.wire_width, "W1")
+            config.wire_width, _W1)
     wire_LP_NE = feat.make_wire(
             geom.route_90deg((D_SW.origin[0] + lower_SW[0], D_SW.origin[1] + lower_SW[1]), temp_point, "|-"),
-            config.wire_width, "W1")
+            config.wire_width, _W1)
     temp_point2 = (D_NW.origin[0] - 25/5*4, LP_1.origin[1])
     wire_LP_pad = feat.make_wire(
             geom.route_90deg(temp_point, temp_point2, "-|") +
             [LP_1.origin],
-            config.wire_width, "W1")
+            config.wire_width, _W1)
     _ = Main.add(wire_LP_NW, wire_LP_NE, wire_LP_pad)
     # LP_2
     wire_LP_2 = feat.make_wire(
             [LP_2.origin,
              (D_NE.origin[0] + lower_NE[0], D_NE.origin[1] + lower_NE[1]),
              (D_SE.origin[0] + lower_SE[0], D_SE.origin[1] + lower_SE[1])],
-            config.wire_width, "W1")
+            config.wire_width, _W1)
     _ = Main.add(wire_LP_2)
     # label
-    label = feat.make_label(name, origin=(sep, - config.pad_device_spacing - config.pad_dim/2), layer=config.layers["label"][0], datatype=config.layers["label"][1])
+    label = feat.make_label(name, origin=(sep, - config.pad_device_spacing - config.pad_dim/2), layer=_LABEL[0], datatype=_LABEL[1])
     _ = Main.add(*label)
     return Main
 
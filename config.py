@@ -14,6 +14,10 @@ layers = {
 UVL = 2
 EBL = 0.05
 
+# fabrication grid; passed as precision to the clipping operations so
+# coordinates are rescaled to integers at the design grid exactly once
+GRID = 1e-3
+
 # general design parameters
 wire_width = 3
 boundary_width = 1
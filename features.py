@@ -1,270 +1,389 @@
-import gdstk
-import numpy as np
-
-import config
-
-import geometry as geom
-
-
-def um_to_str(um: float) -> int:
-    """Converts the float representing microns to nanometres for string output.
-    
-    Parameters
-    ----------
-    um : float
-        The um value to convert to nm.
-    
-    Returns
-    -------
-    int
-        The input multiplied by 1'000.
-    """
-    return int(um*1e3)
-
-
-def make_lower_pad(size_x: float, size_y: float | None=None, tol: float = 30, via: bool = True) -> gdstk.Cell:
-    """Create a cell defining a contact pad starting on the proce card wafer, 
-    with an optional via going to the top wiring layer. The pad shape is an
-    octagon.
-    
-    Parameters
-    ----------
-    size_x : float
-        The horizontal dimension of the pad.
-    size_y : float, optional
-        The vertical dimension of the pad. Defaults to size_x.
-    tol : float, optional
-        The minimum size that a feature of the pad can be. Defaults to
-        30 (um).
-    via : bool, optional
-        Whether to add a via through the dielectric. Defaults to True.
-    
-    Returns
-    -------
-    gdstk.Cell
-        A cell representing a probing pad.
-    """
-    if size_y is None:
-        size_y = size_x
-    pad = gdstk.Cell(f"LowerPad_{um_to_str(size_x)}_{size_y}")
-    pad_metal_bot = geom.octagon(size_x, size_y)
-    geom.set_layer_datatype(pad_metal_bot, config.layers["W1"])
-    pad.add(pad_metal_bot)
-    if via:
-        if min(size_x, size_y) - 4*config.UVL < tol:
-            raise ValueError("Pad size too small.")
-        # via through bonding interface passivation
-        pad_via = geom.octagon(size_x - 2*config.UVL, size_y - 2*config.UVL)
-        geom.set_layer_datatype(pad_via, config.layers["V2"])
-        pad.add(pad_via)
-        # via through other passivation
-        pad_via = geom.octagon(size_x - 2*config.UVL, size_y - 2*config.UVL)
-        geom.set_layer_datatype(pad_via, config.layers["V4"])
-        pad.add(pad_via)
-        # pad at top
-        pad_metal_top = geom.octagon(size_x, size_y)
-        geom.set_layer_datatype(pad_metal_top, config.layers["W2"])
-        pad.add(pad_metal_top)
-    return pad
-
-
-def make_upper_pad(size_x: float, size_y: float | None=None, tol: float=30) -> gdstk.Cell:
-    """Create a cell defining a contact pad on the top of the finished device.
-    The pad shape is an octagon.
-    
-    Parameters
-    ----------
-    size_x : float
-        The horizontal dimension of the pad.
-    size_y : float, optional
-        The vertical dimension of the pad. Defaults to size_x.
-    tol : float, optional
-        The minimum size that a feature of the pad can be. Defaults to
-        30 (um).
-    
-    Returns
-    -------
-    gdstk.Cell
-        A cell representing a probing pad.
-    """
-    if size_y is None:
-        size_y = size_x
-    if min(size_x, size_y)  < tol:
-        raise ValueError("Pad size too small.")
-    pad = gdstk.Cell(f"UpperPad_{um_to_str(size_x)}_{size_y}")
-    pad_metal = geom.octagon(size_x, size_y)
-    geom.set_layer_datatype(pad_metal, config.layers["W2"])
-    pad.add(pad_metal)
-    return pad
-
-
-def make_wire(points: list[tuple[float, float]], width: float, level: str) -> gdstk.FlexPath:
-    """Connect a list of points with a polygon of fixed width.
-    
-    Parameters
-    ----------
-    points : list of (float, float)
-        A list containing the points to connect.
-    width : float
-        The width of the connecting feature.
-    level : string
-        The string which is the key of the config.layers entry defining on
-        which layer/datatype the result should be placed. 
-    
-    Returns
-    -------
-    gdstk.Cell
-        A cell representing a probing pad.
-    """
-    return gdstk.FlexPath(points, width, layer=config.layers[level][0], datatype=config.layers[level][1])
-
-
-def make_ferro_device(mesa_size: float, via_size: float = config.UVL, device_extent: tuple[float, float] = (60, 40), short: bool=False) -> tuple[gdstk.Cell, tuple[float, float], tuple[float, float]]:
-    """Generate a ferroelectric device with top and bottom electrodes and
-    ferroelectric layer in between.
-    
-    Parameters
-    ----------
-    mesa_size : float
-        The size of the mesa.
-    via_size : float, optional
-        The size of the via, by default the UVL clearance.
-    device_extent : (float, float)
-        The extent of the device, determining the position of the elements.
-        Defaults to (80, 40).
-    short : bool, optional
-        Whether the electrodes should be shorted, bypassing the ferroelectric.
-        Defaults to False.
-    
-    Returns
-    -------
-    gdstk.Cell
-        A cell representing a ferroelectric resistive stack.
-    (float, float)
-        The coordinates of the contact point of the bottom electrode.
-    (float, float)
-        The coordinates of the contact point of the top electrode.
-    
-    Raises
-    ------
-    ValueError
-        If structure dimensions exceed the device size.
-    """
-    # clearance both vias to electrodes + their clearances, mesa + its clearance,
-    # clearance between edges of device and mesa and vias (right side of inequality)
-    if  2*via_size + 8*config.UVL + mesa_size + 2*config.UVL > device_extent[0] - 4*config.UVL:
-        raise ValueError("Component dimensions exceed device_extent.")
-    device = gdstk.Cell(f"FerroelectricDevice_M{um_to_str(mesa_size)}_V{um_to_str(via_size)}")
-    if short:
-        device = gdstk.Cell(f"FerroelectricDevice_M{um_to_str(mesa_size)}_V{um_to_str(via_size)}_short")
-    # (contact to) top electrode
-    mesa_centre = (0, 0)
-    # mesa metal
-    mesa_m0 = geom.octagon(mesa_size, origin=mesa_centre)
-    geom.set_layer_datatype(mesa_m0, config.layers["M0"])
-    # via through passivation
-    via_passivation = geom.octagon(mesa_size - 2*config.EBL, origin=mesa_centre)
-    geom.set_layer_datatype(via_passivation, config.layers["V3"])
-    # metal on top of passivation
-    mesa_m2 = geom.octagon(mesa_size + 2*config.UVL, origin=mesa_centre)
-    geom.set_layer_datatype(mesa_m2, config.layers["M2"])
-    device.add(mesa_m0, via_passivation, mesa_m2)
-    
-    top_connection = (-device_extent[0]/2 + via_size + 4*config.UVL, 0)
-    # routing across top
-    wire_LP_D = make_wire([top_connection, mesa_centre], config.wire_width, "M2")
-    via_m2 = geom.octagon(via_size + 2*config.UVL, origin=top_connection)
-    geom.set_layer_datatype(via_m2, config.layers["M2"])
-    # via through bonding interface to bottom electrode
-    via_etch = geom.octagon(via_size, origin=top_connection)
-    geom.set_layer_datatype(via_etch, config.layers["V2"])
-    # bottom pad
-    via_bot_pad = geom.octagon(via_size + 2*config.UVL, origin=top_connection)
-    geom.set_layer_datatype(via_bot_pad, config.layers["W1"])
-    # via top passivation
-    via_p_bot_pad = geom.octagon(via_size + 2*config.UVL, origin=top_connection)
-    geom.set_layer_datatype(via_p_bot_pad, config.layers["V4"])
-    device.add(via_bot_pad, via_etch, via_p_bot_pad, wire_LP_D, via_m2)
-    
-    # contact to bottom electrode
-    via_centre = (device_extent[0]/2 - via_size - 4*config.UVL, 0)
-    bottom_connection = via_centre
-    # via through ferroelectric stack
-    via_FE = geom.octagon(via_size + 2*config.UVL, origin=via_centre)
-    geom.set_layer_datatype(via_FE, config.layers["V1"])
-    # via through bonding interface to bottom electrode
-    via_etch = geom.octagon(via_size, origin=via_centre)
-    geom.set_layer_datatype(via_etch, config.layers["V2"])
-    # via metallisation
-    mesa_m1 = geom.octagon(via_size + 4*config.UVL, origin=via_centre)
-    geom.set_layer_datatype(mesa_m1, config.layers["M1"])
-    # bottom pad
-    if bottom_connection != via_centre:
-        wire_LP_D = make_wire([bottom_connection, via_centre], config.wire_width, "W1")
-    via_bot_pad = geom.octagon(via_size + 2*config.UVL, origin=via_centre)
-    geom.set_layer_datatype(via_bot_pad, config.layers["W1"])
-    device.add(via_etch, mesa_m1, via_bot_pad, wire_LP_D)
-    
-    # FE extent
-    N = max(mesa_m0.bounding_box()[1][1], mesa_m1.bounding_box()[1][1]) + config.UVL
-    W = mesa_m0.bounding_box()[0][0] - config.UVL
-    S = min(mesa_m0.bounding_box()[0][1], mesa_m1.bounding_box()[0][1]) - config.UVL
-    E = mesa_m1.bounding_box()[1][0] + config.UVL
-    FE = gdstk.rectangle((W, S), (E, N))
-    FE = gdstk.boolean(FE, via_FE, "not")[0]
-    geom.set_layer_datatype(FE, config.layers["V1"])
-    device.add(FE)
-    
-    if short:
-        short = FE.copy()
-        geom.set_layer_datatype(short, config.layers["M1"])
-        device.add(short)
-    
-    return device, bottom_connection, top_connection
-
-
-def make_label(text: str, size: float=40, origin: tuple[float, float]=(0, 0), vertical: bool=False, layer: int=0, datatype: int=0) -> list[gdstk.Polygon]:
-    """Create text label and centre at (0, 0).
-    Size is roughly height in um for capitalised characters.
-    
-    Parameters
-    ----------
-    text : string
-        The text to convert to polygons.
-    size : float, optional
-        The heigh in um of a capitalised letter. Defaults to 40.
-    origin : (float, float), optional
-        The position to centre the polygons around. Defaults to (0, 0).
-    vertical : bool, optional
-        Whether to write the text vertically. Defaults to False.
-    layer : int, optional
-        The layer to set for the polgons. Defaults to 0.
-    datatype : int, optional
-        The datatype to set for the polgons. Defaults to 0.
-    
-    Returns
-    -------
-    list of gdstk.Polygon
-        A list containg the polygons representing the text supplied.
-    """
-    ratio = 11/16 # may depend on font
-    text = gdstk.text(text, size*ratio, (0, 0), vertical=vertical, layer=layer, datatype=datatype)
-    # centre text w.r.t. to bounding box, so anchor is there not bottom left
-    if len(text) != 0:
-        ((x0, y0), (x1, y1)) = text[0].bounding_box()
-        bbox = [[x0, y0], [x1, y1]]
-        for polygon in text:
-            polygon_bbox = polygon.bounding_box()
-            if bbox[0][0] > polygon_bbox[0][0]:
-                bbox[0][0] = polygon_bbox[0][0]
-            if bbox[0][1] > polygon_bbox[0][1]:
-                bbox[0][1] = polygon_bbox[0][1]
-            if bbox[1][0] < polygon_bbox[1][0]:
-                bbox[1][0] = polygon_bbox[1][0]
-            if bbox[1][1] < polygon_bbox[1][1]:
-                bbox[1][1] = polygon_bbox[1][1]
-        # translate text
-        for polygon in text:
-            polygon.translate(*(-1 * np.mean(bbox, axis=0)))
-            polygon.translate(origin)
-    return text
+import functools
+
+import gdstk
+import numpy as np
+
+import config
+
+import geometry as geom
+
+# (layer, datatype) tuples hoisted out of the construction paths; config is
+# populated by the build script before this module is imported
+_M0 = config.layers["M0"][:2]
+_M1 = config.layers["M1"][:2]
+_M2 = config.layers["M2"][:2]
+_W1 = config.layers["W1"][:2]
+_W2 = config.layers["W2"][:2]
+_V1 = config.layers["V1"][:2]
+_V2 = config.layers["V2"][:2]
+_V3 = config.layers["V3"][:2]
+_V4 = config.layers["V4"][:2]
+# layer and datatype pre-split into parallel dicts for lookups keyed by the
+# layer name at run time, saving the tuple indexing per polygon
+_LAYER = {key: value[0] for key, value in config.layers.items()}
+_DATATYPE = {key: value[1] for key, value in config.layers.items()}
+
+
+@functools.lru_cache(maxsize=None)
+def _octagon_pts(size: float, origin: tuple[float, float]) -> np.ndarray:
+    """Cached octagon vertex array for a given size and origin, so octagons
+    repeated on several layers share one vertex computation. Delegates to
+    geometry's per-size template points, so the vertex maths lives in one
+    cache; the origin shift is a broadcast add. Callers must treat the
+    returned array as read-only; gdstk.Polygon copies it into its own
+    buffer.
+    """
+    return geom.octagon_points(size, origin=origin)
+
+
+def um_to_str(um: float) -> int:
+    """Converts the float representing microns to nanometres for string output.
+    
+    Parameters
+    ----------
+    um : float
+        The um value to convert to nm.
+    
+    Returns
+    -------
+    int
+        The input multiplied by 1'000.
+    """
+    return int(um*1e3)
+
+
+_pad_cell_names: set[str] = set()
+
+
+def _unique_pad_name(base: str) -> str:
+    """Returns base, or base with a numeric suffix when the name is already
+    taken by a pad cell with different parameters (e.g. another tolerance),
+    since cell names in a library must be unique.
+    """
+    name = base
+    suffix = 1
+    while name in _pad_cell_names:
+        name = f"{base}_{suffix}"
+        suffix += 1
+    _pad_cell_names.add(name)
+    return name
+
+
+def make_lower_pad(size_x: float, size_y: float | None=None, tol: float = 30, via: bool = True) -> gdstk.Cell:
+    """Create a cell defining a contact pad starting on the proce card wafer,
+    with an optional via going to the top wiring layer. The pad shape is an
+    octagon.
+
+    The cell is memoized: repeated calls return the same cell object to be
+    referenced, not a fresh copy.
+
+    Parameters
+    ----------
+    size_x : float
+        The horizontal dimension of the pad.
+    size_y : float, optional
+        The vertical dimension of the pad. Defaults to size_x.
+    tol : float, optional
+        The minimum size that a feature of the pad can be. Defaults to
+        30 (um).
+    via : bool, optional
+        Whether to add a via through the dielectric. Defaults to True.
+
+    Returns
+    -------
+    gdstk.Cell
+        A cell representing a probing pad.
+    """
+    # normalize the default before caching, so explicit and implicit square
+    # pads share one cache entry
+    return _lower_pad_cached(size_x, size_x if size_y is None else size_y, tol, via)
+
+
+@functools.lru_cache(maxsize=None)
+def _lower_pad_cached(size_x: float, size_y: float, tol: float, via: bool) -> gdstk.Cell:
+    UVL = config.UVL
+    name = f"LowerPad_{um_to_str(size_x)}_{um_to_str(size_y)}"
+    if not via:
+        name += "_novia"
+    pad = gdstk.Cell(_unique_pad_name(name))
+    pad.add(geom.octagon(size_x, size_y, layer=_W1[0], datatype=_W1[1]))
+    if via:
+        if min(size_x, size_y) - 4*UVL < tol:
+            raise ValueError("Pad size too small.")
+        # via through bonding interface passivation
+        pad.add(geom.octagon(size_x - 2*UVL, size_y - 2*UVL, layer=_V2[0], datatype=_V2[1]))
+        # via through other passivation
+        pad.add(geom.octagon(size_x - 2*UVL, size_y - 2*UVL, layer=_V4[0], datatype=_V4[1]))
+        # pad at top
+        pad.add(geom.octagon(size_x, size_y, layer=_W2[0], datatype=_W2[1]))
+    return pad
+
+
+def make_upper_pad(size_x: float, size_y: float | None=None, tol: float=30) -> gdstk.Cell:
+    """Create a cell defining a contact pad on the top of the finished device.
+    The pad shape is an octagon.
+
+    The cell is memoized: repeated calls return the same cell object to be
+    referenced, not a fresh copy.
+
+    Parameters
+    ----------
+    size_x : float
+        The horizontal dimension of the pad.
+    size_y : float, optional
+        The vertical dimension of the pad. Defaults to size_x.
+    tol : float, optional
+        The minimum size that a feature of the pad can be. Defaults to
+        30 (um).
+
+    Returns
+    -------
+    gdstk.Cell
+        A cell representing a probing pad.
+    """
+    return _upper_pad_cached(size_x, size_x if size_y is None else size_y, tol)
+
+
+@functools.lru_cache(maxsize=None)
+def _upper_pad_cached(size_x: float, size_y: float, tol: float) -> gdstk.Cell:
+    if min(size_x, size_y)  < tol:
+        raise ValueError("Pad size too small.")
+    pad = gdstk.Cell(_unique_pad_name(f"UpperPad_{um_to_str(size_x)}_{um_to_str(size_y)}"))
+    pad.add(geom.octagon(size_x, size_y, layer=_W2[0], datatype=_W2[1]))
+    return pad
+
+
+def place_array(cell: gdstk.Cell, origin: tuple[float, float], nx: int, ny: int, dx: float, dy: float) -> gdstk.Reference:
+    """Place a cell as a reference array, so the repetition is stored once
+    and expanded by the gdstk core at write time instead of one reference
+    per site.
+
+    Parameters
+    ----------
+    cell : gdstk.Cell
+        The cell to place.
+    origin : (float, float)
+        The position of the first instance.
+    nx : int
+        The number of instances in x.
+    ny : int
+        The number of instances in y.
+    dx : float
+        The pitch in x.
+    dy : float
+        The pitch in y.
+
+    Returns
+    -------
+    gdstk.Reference
+        A single reference covering the whole array.
+    """
+    return gdstk.Reference(cell, origin, columns=nx, rows=ny, spacing=(dx, dy))
+
+
+def make_wire(points: list[tuple[float, float]], width: float, level: str | tuple[int, int]) -> gdstk.FlexPath:
+    """Connect a list of points with a polygon of fixed width.
+
+    Parameters
+    ----------
+    points : list of (float, float)
+        A list containing the points to connect.
+    width : float
+        The width of the connecting feature.
+    level : string or (int, int)
+        Either the key of the config.layers entry defining on which
+        layer/datatype the result should be placed, or that (layer,
+        datatype) tuple directly, which skips the dict lookup.
+
+    Returns
+    -------
+    gdstk.Cell
+        A cell representing a probing pad.
+    """
+    if isinstance(level, str):
+        return gdstk.FlexPath(points, width, layer=_LAYER[level], datatype=_DATATYPE[level])
+    return gdstk.FlexPath(points, width, layer=level[0], datatype=level[1])
+
+
+@functools.lru_cache(maxsize=None)
+def _fe_cutout_points(mesa_size: float, via_size: float, device_extent: tuple[float, float]) -> np.ndarray:
+    """Cached vertex array of the FE layer outline: the device-spanning
+    rectangle with the bottom-contact via cut out as a single keyhole
+    contour. Shared between the FE polygon and the M1 short of the shorted
+    variant; callers must treat the returned array as read-only.
+    """
+    UVL = config.UVL
+    via_centre = (device_extent[0]/2 - via_size - 4*UVL, 0)
+    # octagon extents are known in closed form (+-size/2 around the centre),
+    # so no polygon scans are needed
+    half_m0 = mesa_size/2
+    half_m1 = (via_size + 4*UVL)/2
+    N = max(half_m0, half_m1) + UVL
+    W = -half_m0 - UVL
+    S = -max(half_m0, half_m1) - UVL
+    E = via_centre[0] + half_m1 + UVL
+    # the via sits strictly inside the FE rectangle, so cut the hole
+    # directly instead of going through the clipping engine
+    hole = _octagon_pts(via_size + 2*UVL, via_centre)
+    return geom.polygon_with_hole([(W, S), (E, S), (E, N), (W, N)], hole).points
+
+
+@functools.lru_cache(maxsize=None)
+def _ferro_device_base(mesa_size: float, via_size: float, device_extent: tuple[float, float]) -> tuple[gdstk.Cell, tuple[float, float], tuple[float, float]]:
+    """Cached construction of the unshorted device cell; make_ferro_device
+    hands it out directly or wraps it for the shorted variant, so both
+    variants reference one set of base polygons.
+    """
+    # config lookups bound once; this function runs per device in a mask
+    UVL = config.UVL
+    EBL = config.EBL
+    wire_width = config.wire_width
+    # clearance both vias to electrodes + their clearances, mesa + its clearance,
+    # clearance between edges of device and mesa and vias (right side of inequality)
+    if  2*via_size + 8*UVL + mesa_size + 2*UVL > device_extent[0] - 4*UVL:
+        raise ValueError("Component dimensions exceed device_extent.")
+    device = gdstk.Cell(f"FerroelectricDevice_M{um_to_str(mesa_size)}_V{um_to_str(via_size)}")
+    # (contact to) top electrode
+    mesa_centre = (0, 0)
+    # mesa metal
+    mesa_m0 = gdstk.Polygon(_octagon_pts(mesa_size, mesa_centre), *_M0)
+    # via through passivation
+    via_passivation = gdstk.Polygon(_octagon_pts(mesa_size - 2*EBL, mesa_centre), *_V3)
+    # metal on top of passivation
+    mesa_m2 = gdstk.Polygon(_octagon_pts(mesa_size + 2*UVL, mesa_centre), *_M2)
+    device.add(mesa_m0, via_passivation, mesa_m2)
+
+    top_connection = (-device_extent[0]/2 + via_size + 4*UVL, 0)
+    # routing across top
+    wire_LP_D = make_wire([top_connection, mesa_centre], wire_width, _M2)
+    # the M2/W1/V4 octagons at the top connection share one vertex array
+    top_via_pts = _octagon_pts(via_size + 2*UVL, top_connection)
+    via_m2 = gdstk.Polygon(top_via_pts, *_M2)
+    # via through bonding interface to bottom electrode
+    via_etch = gdstk.Polygon(_octagon_pts(via_size, top_connection), *_V2)
+    # bottom pad
+    via_bot_pad = gdstk.Polygon(top_via_pts, *_W1)
+    # via top passivation
+    via_p_bot_pad = gdstk.Polygon(top_via_pts, *_V4)
+    device.add(via_bot_pad, via_etch, via_p_bot_pad, wire_LP_D, via_m2)
+
+    # contact to bottom electrode
+    via_centre = (device_extent[0]/2 - via_size - 4*UVL, 0)
+    bottom_connection = via_centre
+    # the V1/W1 octagons at the bottom contact share one vertex array; the
+    # same array forms the hole of the FE cutout below
+    bot_via_pts = _octagon_pts(via_size + 2*UVL, via_centre)
+    # via through bonding interface to bottom electrode
+    via_etch = gdstk.Polygon(_octagon_pts(via_size, via_centre), *_V2)
+    # via metallisation
+    mesa_m1 = gdstk.Polygon(_octagon_pts(via_size + 4*UVL, via_centre), *_M1)
+    # bottom pad
+    if bottom_connection != via_centre:
+        wire_LP_D = make_wire([bottom_connection, via_centre], wire_width, _W1)
+    via_bot_pad = gdstk.Polygon(bot_via_pts, *_W1)
+    device.add(via_etch, mesa_m1, via_bot_pad, wire_LP_D)
+
+    # FE layer: rectangle spanning the device with the via cut out
+    FE = gdstk.Polygon(_fe_cutout_points(mesa_size, via_size, device_extent), *_V1)
+    device.add(FE)
+
+    return device, bottom_connection, top_connection
+
+
+def make_ferro_device(mesa_size: float, via_size: float = config.UVL, device_extent: tuple[float, float] = (60, 40), short: bool=False) -> tuple[gdstk.Cell, tuple[float, float], tuple[float, float]]:
+    """Generate a ferroelectric device with top and bottom electrodes and
+    ferroelectric layer in between.
+
+    The unshorted cell is memoized; the shorted variant is a thin wrapper
+    cell holding a reference to it plus the shorting polygon, so both
+    variants share the base polygons in memory and in the written library.
+
+    Parameters
+    ----------
+    mesa_size : float
+        The size of the mesa.
+    via_size : float, optional
+        The size of the via, by default the UVL clearance.
+    device_extent : (float, float)
+        The extent of the device, determining the position of the elements.
+        Defaults to (80, 40).
+    short : bool, optional
+        Whether the electrodes should be shorted, bypassing the ferroelectric.
+        Defaults to False.
+
+    Returns
+    -------
+    gdstk.Cell
+        A cell representing a ferroelectric resistive stack.
+    (float, float)
+        The coordinates of the contact point of the bottom electrode.
+    (float, float)
+        The coordinates of the contact point of the top electrode.
+
+    Raises
+    ------
+    ValueError
+        If structure dimensions exceed the device size.
+    """
+    device, bottom_connection, top_connection = _ferro_device_base(mesa_size, via_size, tuple(device_extent))
+    if short:
+        wrapper = gdstk.Cell(f"{device.name}_short")
+        wrapper.add(gdstk.Reference(device, (0, 0)))
+        # short bypassing the ferroelectric, same outline as the FE layer
+        wrapper.add(gdstk.Polygon(_fe_cutout_points(mesa_size, via_size, device_extent), *_M1))
+        return wrapper, bottom_connection, top_connection
+    return device, bottom_connection, top_connection
+
+
+@functools.lru_cache(maxsize=256)
+def _label_template(text: str, size: float, vertical: bool, layer: int, datatype: int) -> tuple[gdstk.Polygon, ...]:
+    """Cached glyph polygons for a label, centred on (0, 0); make_label
+    hands out translated copies, so repeated labels (e.g. the same device
+    name across dies) rasterise the text once.
+    """
+    ratio = 11/16 # may depend on font
+    polygons = gdstk.text(text, size*ratio, (0, 0), vertical=vertical, layer=layer, datatype=datatype)
+    # centre text w.r.t. to bounding box, so anchor is there not bottom left
+    if len(polygons) != 0:
+        # stack all glyph bounding boxes and reduce in two C-level passes
+        bboxes = np.array([polygon.bounding_box() for polygon in polygons])
+        lo = bboxes[:, 0].min(axis=0)
+        hi = bboxes[:, 1].max(axis=0)
+        delta = -(lo + hi) / 2
+        for polygon in polygons:
+            polygon.translate(*delta)
+    return tuple(polygons)
+
+
+def make_label(text: str, size: float=40, origin: tuple[float, float]=(0, 0), vertical: bool=False, layer: int=0, datatype: int=0) -> list[gdstk.Polygon]:
+    """Create text label and centre at (0, 0).
+    Size is roughly height in um for capitalised characters.
+
+    The glyph polygons are memoized per (text, size, orientation, layer),
+    so only the translation to origin is recomputed on repeated calls.
+
+    Parameters
+    ----------
+    text : string
+        The text to convert to polygons.
+    size : float, optional
+        The heigh in um of a capitalised letter. Defaults to 40.
+    origin : (float, float), optional
+        The position to centre the polygons around. Defaults to (0, 0).
+    vertical : bool, optional
+        Whether to write the text vertically. Defaults to False.
+    layer : int, optional
+        The layer to set for the polgons. Defaults to 0.
+    datatype : int, optional
+        The datatype to set for the polgons. Defaults to 0.
+
+    Returns
+    -------
+    list of gdstk.Polygon
+        A list containg the polygons representing the text supplied.
+    """
+    # empty label slots are common; skip the rasteriser outright
+    if not text:
+        return []
+    template = _label_template(text, size, vertical, layer, datatype)
+    return [polygon.copy().translate(origin[0], origin[1]) for polygon in template]
@@ -1,167 +1,394 @@
-import gdstk
-
-def rectangle(x: float, y: float, origin: tuple[float, float] = (0,0)) -> gdstk.Polygon:
-    """Returns a rectangular polygon centred around origin of shape (x, y).
-
-    Parameters
-    ----------
-    x : float
-        The horizontal size of the octagon.
-    y : float, optional
-        The vertical size of the octagon. Defaults to x.
-    origin: (float, float), optional
-        The coordinate around which to centre the octagon. Defaults to (0, 0).
-    Returns
-    -------
-    gdstk.Polygon
-        A polygon with the points of an rectangle.
-    """
-    return gdstk.rectangle(
-        (origin[0]-x/2, origin[1]-y/2), 
-        (origin[0]+x/2, origin[1]+y/2)
-    )
-
-def octagon(x: float, y: float | None = None, origin: tuple[float, float] = (0,0), ratio_x: float = 1/6, ratio_y: float | None = None) -> gdstk.Polygon:
-    """Returns an octagon polygon centred around origin of shape (x, y).
-
-    Parameters
-    ----------
-    x : float
-        The horizontal size of the octagon.
-    y : float, optional
-        The vertical size of the octagon. Defaults to x.
-    origin: (float, float), optional
-        The coordinate around which to centre the octagon. Defaults to (0, 0).
-    ratio_x : float, optional
-        How far to cut the corners of a rectangle back in x to form the
-        octagonal shape. Defaults to 1/6.
-    ratio_y : float, optional
-        How far to cut the corners of a rectangle back in y to form the
-        octagonal shape. Defaults to 1/6.
-    
-    Returns
-    -------
-    gdstk.Polygon
-        A polygon with the points of an octagon.
-    """
-    if y is None:
-        y = x
-    if ratio_y is None:
-        ratio_y = ratio_x
-    return gdstk.Polygon([
-            (origin[0]+2*x*ratio_x, origin[1]+y/2),
-            (origin[0]+x/2,         origin[1]+2*y*ratio_y),
-            (origin[0]+x/2,         origin[1]-2*y*ratio_y),
-            (origin[0]+2*x*ratio_x, origin[1]-y/2),
-            (origin[0]-2*x*ratio_x, origin[1]-y/2),
-            (origin[0]-x/2,         origin[1]-2*y*ratio_y),
-            (origin[0]-x/2,         origin[1]+2*y*ratio_y),
-            (origin[0]-2*x*ratio_x, origin[1]+y/2)
-        ])
-
-
-def route_90deg(c0: tuple[float, float], c1: tuple[float, float], method: str="-|") -> list[tuple[float, float]]:
-    """Returns three points connecting two coordinates with a right angle path.
-    
-    Parameters
-    ----------
-    c0 : (float, float)
-        Coordinate of the first point.
-    c1 : (float, float)
-        Coordinate of the second point.
-    method : str, optional
-        Whether to go vertical or horizontal first. Defaults to '-|'.
-    
-    Returns
-    -------
-    list of (float, float)
-        A list of the original coordinates with the corner coordinate inserted
-        between them.
-    
-    Raises
-    ------
-    ValueError
-        If the method is not '-|' or '|-'.
-    """
-    match method:
-        case "-|":
-            corner = (c1[0], c0[1])
-        case "|-":
-            corner = (c0[0], c1[1])
-        case _:
-            raise ValueError(f"Unknown routing method '{method}'.")
-    return [c0, corner, c1]
-
-
-def set_layer_datatype(polygon: gdstk.Polygon, layer_datatype: tuple[int, int]) -> None:
-    """Sets the layer and datatype tuple for the polygon.
-    
-    Parameters
-    ----------
-    polygon: gdstk.Polygon
-        The polygon of which to set layer and datatype.
-    layer_datatype: (int, int)
-        The layer and datatype to set the polygon to
-    """
-    polygon.layer = layer_datatype[0]
-    polygon.datatype = layer_datatype[1]
-
-
-def convert_to_boundary(polygon: gdstk.Polygon, width: float) -> list[gdstk.Polygon]:
-    """Creates polygons that form a boundary of supplied width extending out
-    from the supplied polygon.
-    
-    Parameters
-    ----------
-    polygon: gdstk.Polygon
-        The polygon to operate on.
-    width: float
-        The size of the boundary.
-    
-    Returns
-    -------
-    list of gdstk.Polygon
-        A list containg the polygons defining the boundary of the input polygon.
-    """
-    enlarged = gdstk.offset(polygon, width)
-    return gdstk.boolean(enlarged, polygon, "not", layer=polygon.layer, datatype=polygon.datatype)
-
-
-def reverse_polarity(polygon: gdstk.Polygon, bounding_polygon: gdstk.Polygon) -> list[gdstk.Polygon]:
-    """Subtracts the first polygon from the second polygon.
-    
-    Parameters
-    ----------
-    polygon: gdstk.Polygon
-        The polygon to subtract.
-    bounding_polygon: gdstk.Polygon
-        The polygon to be subtracted from.
-    
-    Returns
-    -------
-    list of gdstk.Polygon
-        A list containg the polygons resulting from the subtraction.
-    """
-    return gdstk.boolean(bounding_polygon, polygon, "not", layer=polygon.layer, datatype=polygon.datatype)
-
-
-def flatten(input: list) -> list:
-    """Flattens the supplied list recursively.
-    
-    Parameters
-    ----------
-    input : float
-        The possibly nested list to flatten.
-    
-    Returns
-    -------
-    list
-        A list of all entries of the input
-    """
-    result = []
-    for item in input:
-        if isinstance(item, list):
-            result.extend(flatten(item))
-        else:
-            result.append(item)
-    return result
+import functools
+
+import gdstk
+import numpy as np
+
+
+@functools.lru_cache(maxsize=512)
+def _rectangle_template(x: float, y: float) -> gdstk.Polygon:
+    """Cached rectangle template centred on (0, 0); rectangle() hands out
+    translated copies.
+    """
+    return gdstk.rectangle((-x/2, -y/2), (x/2, y/2))
+
+
+def rectangle(x: float, y: float, origin: tuple[float, float] = (0,0), layer: int = 0, datatype: int = 0) -> gdstk.Polygon:
+    """Returns a rectangular polygon centred around origin of shape (x, y).
+    The shape is memoized per size, so repeated sizes copy a cached template
+    instead of rebuilding the point list.
+
+    Parameters
+    ----------
+    x : float
+        The horizontal size of the octagon.
+    y : float, optional
+        The vertical size of the octagon. Defaults to x.
+    origin: (float, float), optional
+        The coordinate around which to centre the octagon. Defaults to (0, 0).
+    layer : int, optional
+        The layer to set for the polygon. Defaults to 0.
+    datatype : int, optional
+        The datatype to set for the polygon. Defaults to 0.
+
+    Returns
+    -------
+    gdstk.Polygon
+        A polygon with the points of an rectangle.
+    """
+    polygon = _rectangle_template(x, y).copy().translate(origin[0], origin[1])
+    polygon.layer = layer
+    polygon.datatype = datatype
+    return polygon
+
+
+@functools.lru_cache(maxsize=512)
+def _octagon_template(x: float, y: float, ratio_x: float, ratio_y: float) -> gdstk.Polygon:
+    """Cached octagon template centred on (0, 0); octagon() hands out
+    translated copies. The vertices are assembled in a single float64
+    array, which gdstk adopts without the per-tuple conversion a list of
+    tuples would go through.
+    """
+    cut_x = 2*x*ratio_x
+    cut_y = 2*y*ratio_y
+    points = np.empty((8, 2), dtype=np.float64)
+    points[:, 0] = ( cut_x,  x/2,  x/2,  cut_x, -cut_x, -x/2, -x/2, -cut_x)
+    points[:, 1] = (   y/2, cut_y, -cut_y, -y/2,   -y/2, -cut_y,  cut_y,  y/2)
+    return gdstk.Polygon(points)
+
+
+@functools.lru_cache(maxsize=512)
+def _octagon_template_points(x: float, y: float, ratio_x: float, ratio_y: float) -> np.ndarray:
+    """Cached vertex array of the octagon template, so points-level callers
+    skip the Polygon.points copy per access. The array is shared; callers
+    must treat it as read-only.
+    """
+    return _octagon_template(x, y, ratio_x, ratio_y).points
+
+
+def octagon_points(x: float, y: float | None = None, origin: tuple[float, float] = (0,0), ratio_x: float = 1/6, ratio_y: float | None = None) -> np.ndarray:
+    """Returns the vertex array of an octagon centred around origin of shape
+    (x, y), as octagon() does, without constructing a gdstk.Polygon. The
+    origin is broadcast-added onto the cached per-size template points.
+
+    Parameters
+    ----------
+    x : float
+        The horizontal size of the octagon.
+    y : float, optional
+        The vertical size of the octagon. Defaults to x.
+    origin: (float, float), optional
+        The coordinate around which to centre the octagon. Defaults to (0, 0).
+    ratio_x : float, optional
+        How far to cut the corners of a rectangle back in x to form the
+        octagonal shape. Defaults to 1/6.
+    ratio_y : float, optional
+        How far to cut the corners of a rectangle back in y to form the
+        octagonal shape. Defaults to 1/6.
+
+    Returns
+    -------
+    ndarray
+        An (8, 2) array with the points of an octagon.
+    """
+    if y is None:
+        y = x
+    if ratio_y is None:
+        ratio_y = ratio_x
+    return _octagon_template_points(x, y, ratio_x, ratio_y) + np.asarray(origin, dtype=np.float64)
+
+
+def octagon(x: float, y: float | None = None, origin: tuple[float, float] = (0,0), ratio_x: float = 1/6, ratio_y: float | None = None, layer: int = 0, datatype: int = 0) -> gdstk.Polygon:
+    """Returns an octagon polygon centred around origin of shape (x, y).
+    The shape is memoized per (size, ratio), so repeated sizes copy a cached
+    template instead of rebuilding the point list.
+
+    Parameters
+    ----------
+    x : float
+        The horizontal size of the octagon.
+    y : float, optional
+        The vertical size of the octagon. Defaults to x.
+    origin: (float, float), optional
+        The coordinate around which to centre the octagon. Defaults to (0, 0).
+    ratio_x : float, optional
+        How far to cut the corners of a rectangle back in x to form the
+        octagonal shape. Defaults to 1/6.
+    ratio_y : float, optional
+        How far to cut the corners of a rectangle back in y to form the
+        octagonal shape. Defaults to 1/6.
+    layer : int, optional
+        The layer to set for the polygon. Defaults to 0.
+    datatype : int, optional
+        The datatype to set for the polygon. Defaults to 0.
+
+    Returns
+    -------
+    gdstk.Polygon
+        A polygon with the points of an octagon.
+    """
+    if y is None:
+        y = x
+    if ratio_y is None:
+        ratio_y = ratio_x
+    polygon = _octagon_template(x, y, ratio_x, ratio_y).copy().translate(origin[0], origin[1])
+    polygon.layer = layer
+    polygon.datatype = datatype
+    return polygon
+
+
+def route_90deg(c0: tuple[float, float], c1: tuple[float, float], method: str="-|") -> list[tuple[float, float]]:
+    """Returns three points connecting two coordinates with a right angle path.
+    
+    Parameters
+    ----------
+    c0 : (float, float)
+        Coordinate of the first point.
+    c1 : (float, float)
+        Coordinate of the second point.
+    method : str, optional
+        Whether to go vertical or horizontal first. Defaults to '-|'.
+    
+    Returns
+    -------
+    list of (float, float)
+        A list of the original coordinates with the corner coordinate inserted
+        between them.
+    
+    Raises
+    ------
+    ValueError
+        If the method is not '-|' or '|-'.
+    """
+    if method == "-|":
+        corner = (c1[0], c0[1])
+    elif method == "|-":
+        corner = (c0[0], c1[1])
+    else:
+        raise ValueError(f"Unknown routing method '{method}'.")
+    return [c0, corner, c1]
+
+
+def set_layer_datatype(polygon: gdstk.Polygon, layer_datatype: tuple[int, int]) -> None:
+    """Sets the layer and datatype tuple for the polygon.
+    
+    Parameters
+    ----------
+    polygon: gdstk.Polygon
+        The polygon of which to set layer and datatype.
+    layer_datatype: (int, int)
+        The layer and datatype to set the polygon to
+    """
+    polygon.layer = layer_datatype[0]
+    polygon.datatype = layer_datatype[1]
+
+
+def merge_and_boundary(polygons: list[gdstk.Polygon], width: float, precision: float = 1e-3, layer: int = 0, datatype: int = 0) -> list[gdstk.Polygon]:
+    """Merges the polygons of a layer and converts the merged result into
+    its boundary in one pipeline.
+
+    The boundary is computed as the offset of the whole merged layer minus
+    the merged layer, i.e. one offset and one clipping call, instead of a
+    per-polygon conversion whose intermediate lists all round-trip through
+    Python.
+
+    Parameters
+    ----------
+    polygons : list of gdstk.Polygon
+        The polygons of the layer to operate on.
+    width : float
+        The size of the boundary.
+    precision : float, optional
+        The precision passed to the clipping engine, typically the
+        fabrication grid. Defaults to 1e-3.
+    layer : int, optional
+        The layer to set for the resulting polygons. Defaults to 0.
+    datatype : int, optional
+        The datatype to set for the resulting polygons. Defaults to 0.
+
+    Returns
+    -------
+    list of gdstk.Polygon
+        A list containing the polygons defining the boundary of the merged
+        input polygons.
+    """
+    merged = boolean_tiled(polygons, "or", precision=precision, layer=layer, datatype=datatype)
+    enlarged = gdstk.offset(merged, width, precision=precision)
+    return gdstk.boolean(enlarged, merged, "not", precision=precision, layer=layer, datatype=datatype)
+
+
+def _signed_area(points: np.ndarray) -> float:
+    """Returns the signed (shoelace) area of a closed contour; positive for
+    counter-clockwise orientation.
+    """
+    x = points[:, 0]
+    y = points[:, 1]
+    return 0.5 * float(np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y))
+
+
+def polygon_with_hole(outer: list[tuple[float, float]] | np.ndarray, hole: list[tuple[float, float]] | np.ndarray, layer: int = 0, datatype: int = 0) -> gdstk.Polygon:
+    """Creates a single polygon from an outer contour with a hole cut out,
+    joined by a zero-width bridge, skipping the clipping engine for
+    subtractions whose result is known analytically.
+
+    Parameters
+    ----------
+    outer : list of (float, float) or ndarray
+        The outer contour. The hole must lie strictly inside it.
+    hole : list of (float, float) or ndarray
+        The contour of the hole. Must be convex so the bridge cannot cross
+        it.
+    layer : int, optional
+        The layer to set for the resulting polygon. Defaults to 0.
+    datatype : int, optional
+        The datatype to set for the resulting polygon. Defaults to 0.
+
+    Returns
+    -------
+    gdstk.Polygon
+        A polygon covering the outer contour minus the hole.
+    """
+    outer = np.asarray(outer, dtype=np.float64)
+    hole = np.asarray(hole, dtype=np.float64)
+    # hole must wind opposite to the outer contour
+    if _signed_area(outer) * _signed_area(hole) > 0:
+        hole = hole[::-1]
+    # bridge between the lower-left-most vertices of both contours, so the
+    # bridge stays outside a convex hole
+    outer = np.roll(outer, -int(np.argmin(outer.sum(axis=1))), axis=0)
+    hole = np.roll(hole, -int(np.argmin(hole.sum(axis=1))), axis=0)
+    points = np.vstack([outer, outer[:1], hole, hole[:1]])
+    return gdstk.Polygon(points, layer, datatype)
+
+
+def convert_to_boundary(polygon: gdstk.Polygon, width: float, neighbours: list[gdstk.Polygon] | None = None) -> list[gdstk.Polygon]:
+    """Creates polygons that form a boundary of supplied width extending out
+    from the supplied polygon.
+
+    Parameters
+    ----------
+    polygon: gdstk.Polygon
+        The polygon to operate on.
+    width: float
+        The size of the boundary.
+    neighbours: list of gdstk.Polygon, optional
+        Polygons on the same layer close enough that the boundary could
+        reach into them; they are subtracted from the result as well. The
+        caller is expected to pre-filter these, e.g. by bounding box, so
+        the clipping call only sees locally-relevant polygons.
+
+    Returns
+    -------
+    list of gdstk.Polygon
+        A list containg the polygons defining the boundary of the input polygon.
+    """
+    enlarged = gdstk.offset(polygon, width)
+    subtract = [polygon] if neighbours is None else [polygon, *neighbours]
+    return gdstk.boolean(enlarged, subtract, "not", layer=polygon.layer, datatype=polygon.datatype)
+
+
+def boolean_tiled(polygons: list[gdstk.Polygon], operation: str, nx: int | None = None, ny: int | None = None, precision: float = 1e-3, layer: int = 0, datatype: int = 0) -> list[gdstk.Polygon]:
+    """Performs a boolean operation tile by tile to limit the polygon count
+    seen by any single clipping call, which grows super-linearly in cost.
+
+    The polygons are binned into an nx by ny grid of tiles covering their
+    common bounding box, the operation is applied per tile, and a final pass
+    stitches the per-tile results together across tile seams.
+
+    Parameters
+    ----------
+    polygons : list of gdstk.Polygon
+        The polygons to operate on.
+    operation : str
+        The boolean operation to apply, e.g. 'or'.
+    nx : int, optional
+        The number of tiles in x. Defaults to a heuristic based on the
+        polygon count.
+    ny : int, optional
+        The number of tiles in y. Defaults to nx.
+    precision : float, optional
+        The precision passed to the clipping engine, typically the
+        fabrication grid. Defaults to 1e-3.
+    layer : int, optional
+        The layer to set for the resulting polygons. Defaults to 0.
+    datatype : int, optional
+        The datatype to set for the resulting polygons. Defaults to 0.
+
+    Returns
+    -------
+    list of gdstk.Polygon
+        A list containing the polygons resulting from the operation.
+    """
+    if nx is None:
+        nx = max(1, round(np.sqrt(len(polygons) / 256)))
+    if ny is None:
+        ny = nx
+    if nx * ny <= 1:
+        return gdstk.boolean(polygons, [], operation, precision=precision, layer=layer, datatype=datatype)
+    # bin each polygon by the tile containing its bounding box centre; the
+    # stitch pass below repairs anything crossing a tile seam
+    bboxes = np.empty((len(polygons), 4))
+    for i, polygon in enumerate(polygons):
+        (x0, y0), (x1, y1) = polygon.bounding_box()
+        bboxes[i] = (x0, y0, x1, y1)
+    centres = (bboxes[:, :2] + bboxes[:, 2:]) / 2
+    lower = bboxes[:, :2].min(axis=0)
+    upper = bboxes[:, 2:].max(axis=0)
+    extent = np.maximum(upper - lower, 1e-12)
+    ix = np.clip(((centres[:, 0] - lower[0]) / extent[0] * nx).astype(np.int64), 0, nx - 1)
+    iy = np.clip(((centres[:, 1] - lower[1]) / extent[1] * ny).astype(np.int64), 0, ny - 1)
+    tile_id = ix * ny + iy
+    # group indices per tile in one sort instead of scanning the id array
+    # once per tile
+    order = np.argsort(tile_id, kind="stable")
+    splits = np.flatnonzero(np.diff(tile_id[order])) + 1
+    merged = []
+    for group in np.split(order, splits):
+        subset = [polygons[i] for i in group]
+        merged.extend(gdstk.boolean(subset, [], operation, precision=precision, layer=layer, datatype=datatype))
+    return gdstk.boolean(merged, [], operation, precision=precision, layer=layer, datatype=datatype)
+
+
+def reverse_polarity(polygon: gdstk.Polygon, bounding_polygon: gdstk.Polygon) -> list[gdstk.Polygon]:
+    """Subtracts the first polygon from the second polygon.
+    
+    Parameters
+    ----------
+    polygon: gdstk.Polygon
+        The polygon to subtract.
+    bounding_polygon: gdstk.Polygon
+        The polygon to be subtracted from.
+    
+    Returns
+    -------
+    list of gdstk.Polygon
+        A list containg the polygons resulting from the subtraction.
+    """
+    return gdstk.boolean(bounding_polygon, polygon, "not", layer=polygon.layer, datatype=polygon.datatype)
+
+
+def flatten(input: list) -> list:
+    """Flattens the supplied list iteratively with an explicit stack, so
+    deeply nested input costs no Python call frames and cannot hit the
+    recursion limit.
+
+    Parameters
+    ----------
+    input : float
+        The possibly nested list to flatten.
+
+    Returns
+    -------
+    list
+        A list of all entries of the input
+    """
+    result = []
+    stack = [iter(input)]
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, list):
+                stack.append(iter(item))
+                break
+            result.append(item)
+        else:
+            stack.pop()
+    return result